@@ -1,21 +1,29 @@
 # app.py
-from flask import Flask, request, render_template, jsonify
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import LabelEncoder
+from flask import Flask, request, render_template, jsonify, Response
 import numpy as np
-import librosa
 import os
-import json
 from pydub import AudioSegment
 import uuid
 import sys
+import logging
 import threading
 import pyttsx3
 import time
+from log_utils import setup_logging, shutdown_logging, get_logger, enable_byte_trace, byte_trace_enabled, serial_traffic
 from serial_utils import SerialCommunicator # Ensure serial_utils.py is in the same directory
+from audio_features import load_audio, drop_silence, SILENCE_TOP_DB
+from mfcc_engine import compute_mfcc_mean
+from ui_events import StatusBroadcaster, RobotCommandWorker, coalesce_events
+from model_bundle import (ModelBundle, ModelManager, load_model_file, load_preprocessing, bundle_version,
+                          INFERENCE_MODES)
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
 
+# Log records are queued and written by a background thread, off the request path.
+# Use logging.DEBUG to see every serial command; per-byte tracing is toggled via /admin/serial_log.
+setup_logging(level=logging.INFO)
+logger = get_logger("app")
+
 # Initialize Serial Communicator (adjust COM port and baudrate as needed)
 # Set enabled=False if you don't have an Arduino connected or don't want serial communication
 serial_comm = SerialCommunicator(port="COM4", baudrate=9600, enabled=True)
@@ -37,15 +45,48 @@ voice_lock = threading.Lock() # To prevent overlapping speech
 # Default hold time in milliseconds if not specified for a servo in the command
 DEFAULT_HOLD_MS_COMMAND = 1500 # Minimum 1.5 seconds as requested
 
+# ✅ Model bundle config
+# Directory holding respiratory_model.h5, X_mean.npy, input_std.json and label_mapping.json
+MODEL_DIR = "models"
+# Poll MODEL_DIR every N seconds and hot-reload when files change. Set to 0 to disable
+# the watcher and only reload through POST /admin/reload_model.
+MODEL_WATCH_INTERVAL_SEC = 0
+# "float" runs the Keras float32 model. "int8" runs the int8 TFLite model
+# (respiratory_model_int8.tflite, created with quantize_model.py) for low-power machines.
+INFERENCE_MODE = "float" # "float" or "int8" (model_bundle.INFERENCE_MODES)
+# Run the Keras model through a graph-compiled (1, 40) call path traced and warmed up at load
+# time instead of model.predict(). Compare both with benchmark_inference.py.
+COMPILED_INFERENCE = True
+
+# ✅ Activity detection config
+# Drop silent / low-energy regions (stethoscope gaps, handling noise floor) before MFCC pooling.
+# Compare against the full-clip path with validate_silence_skip.py before enabling.
+# Frames more than audio_features.SILENCE_TOP_DB below the loudest frame are treated as silence.
+SKIP_SILENCE = False
+
+# ✅ MFCC extraction config
+# MFCCs come from mfcc_engine.compute_mfcc_mean(), shared with the offline tools.
+# MFCCEngine precomputes the window, mel filterbank and DCT once and matches
+# librosa.feature.mfcc within mfcc_engine.MFCC_TOLERANCE (check with benchmark_mfcc.py).
+# Set mfcc_engine.USE_MFCC_ENGINE to False to fall back to librosa.feature.mfcc.
+
 # Function to speak text
 def speak(text):
     with voice_lock: # Ensure only one speech output at a time
         try:
-            print(f"🗣️ Speaking: {text}")
+            logger.info(f"🗣️ Speaking: {text}")
             engine.say(text)
             engine.runAndWait()
         except Exception as e:
-            print(f"❌ Voice output error: {e}", file=sys.stderr)
+            logger.error(f"❌ Voice output error: {e}")
+
+# ✅ Server-push status stream
+# The UI subscribes to GET /events for robot, batch, job, prediction and model status.
+status_broadcaster = StatusBroadcaster()
+# Held for a whole LCD + servo sequence so commands from request handlers and the
+# background worker never interleave on the serial line, and so the robot busy/idle
+# state published by send_serial() covers every command, not just /action/batch.
+robot_lock = threading.Lock()
 
 # ✅ Unified serial & voice interaction function with new servo format
 def send_serial(lcd_message=None, voice_message=None,
@@ -58,55 +99,68 @@ def send_serial(lcd_message=None, voice_message=None,
     - voice_message: Text to speak.
     - head_angle, handl_angle, handr_angle: Target servo angles (0-180).
     - head_hold_ms, handl_hold_ms, handr_hold_ms: Time in milliseconds to hold position.
+    Publishes robot busy/idle on /events around the whole sequence.
     """
-    try:
-        # Send LCD message
-        if lcd_message is not None:
-            serial_comm.send(f"lcd:{lcd_message.strip()}\n")
-            time.sleep(0.08) # 80 ms gap after LCD command
-
-        # Prepare servo command using the new format: servo:H,HT;L,LT;R,RT\n
-        _head_angle = head_angle if head_angle is not None else 0
-        _head_hold_ms = head_hold_ms if head_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
-
-        _handl_angle = handl_angle if handl_angle is not None else 0
-        _handl_hold_ms = handl_hold_ms if handl_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
-
-        _handr_angle = handr_angle if handr_angle is not None else 0
-        _handr_hold_ms = handr_hold_ms if handr_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
-
-        full_servo_command = (
-            f"servo:{_head_angle},{_head_hold_ms};"
-            f"{_handl_angle},{_handl_hold_ms};"
-            f"{_handr_angle},{_handr_hold_ms}\n"
-        )
+    with robot_lock:
+        status_broadcaster.publish("robot", {"state": "busy", "lcd_message": lcd_message,
+                                             "servos": {"head_angle": head_angle, "head_hold_ms": head_hold_ms,
+                                                        "handl_angle": handl_angle, "handl_hold_ms": handl_hold_ms,
+                                                        "handr_angle": handr_angle, "handr_hold_ms": handr_hold_ms}})
+        try:
+            # Send LCD message
+            if lcd_message is not None:
+                serial_comm.send(f"lcd:{lcd_message.strip()}\n")
+                time.sleep(0.08) # 80 ms gap after LCD command
+
+            # Prepare servo command using the new format: servo:H,HT;L,LT;R,RT\n
+            _head_angle = head_angle if head_angle is not None else 0
+            _head_hold_ms = head_hold_ms if head_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
+
+            _handl_angle = handl_angle if handl_angle is not None else 0
+            _handl_hold_ms = handl_hold_ms if handl_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
+
+            _handr_angle = handr_angle if handr_angle is not None else 0
+            _handr_hold_ms = handr_hold_ms if handr_hold_ms is not None else DEFAULT_HOLD_MS_COMMAND
+
+            full_servo_command = (
+                f"servo:{_head_angle},{_head_hold_ms};"
+                f"{_handl_angle},{_handl_hold_ms};"
+                f"{_handr_angle},{_handr_hold_ms}\n"
+            )
         
-        # Send servo command
-        serial_comm.send(full_servo_command)
+            # Send servo command
+            serial_comm.send(full_servo_command)
         
-        # Determine the longest hold time to sleep for
-        max_hold_time_sec = max(_head_hold_ms, _handl_hold_ms, _handr_hold_ms) / 1000.0
-        time.sleep(max_hold_time_sec + 0.08) # Wait for longest servo movement to complete + 80ms gap
+            # Determine the longest hold time to sleep for
+            max_hold_time_sec = max(_head_hold_ms, _handl_hold_ms, _handr_hold_ms) / 1000.0
+            time.sleep(max_hold_time_sec + 0.08) # Wait for longest servo movement to complete + 80ms gap
 
-        # Trigger voice output
-        if voice_message:
-            threading.Thread(target=speak, args=(voice_message,)).start()
+            # Trigger voice output
+            if voice_message:
+                threading.Thread(target=speak, args=(voice_message,)).start()
 
-    except Exception as e:
-        print(f"❌ send_serial error: {e}", file=sys.stderr)
+        except Exception as e:
+            logger.error(f"❌ send_serial error: {e}")
+        finally:
+            status_broadcaster.publish("robot", {"state": "idle", "lcd_message": lcd_message})
+
+# ✅ Background robot command worker
+# The UI sends its events in batches to POST /action/batch instead of one blocking
+# request per event; the worker runs them through send_serial().
+robot_worker = RobotCommandWorker(send_serial, status_broadcaster, speak)
 
 
 # --- Application Startup Actions ---
 # Action when the model is loaded
 try:
-    model = load_model("models/respiratory_model.h5")
+    model = load_model_file(MODEL_DIR, INFERENCE_MODE)
     # Initial model load action
     send_serial(lcd_message="Model Loaded", voice_message="Deep learning model is ready.",
                 head_angle=90, head_hold_ms=2000,
                 handl_angle=45, handl_hold_ms=2000,
                 handr_angle=135, handr_hold_ms=2000)
 except Exception as e:
-    print(f"❌ Error loading Keras model: {e}", file=sys.stderr)
+    logger.error(f"❌ Error loading Keras model: {e}")
     # Model load error action
     send_serial(lcd_message="Model Error!", voice_message="Failed to load deep learning model. Please check model files.",
                 head_angle=45, head_hold_ms=2000,
@@ -116,21 +170,17 @@ except Exception as e:
 
 # Action when mean/std and label mapping are loaded
 try:
-    X_mean = np.load("models/X_mean.npy")
-    with open("models/input_std.json") as f:
-        input_std = np.array(json.load(f))
-    with open("models/label_mapping.json") as f:
-        label_mapping = json.load(f)
-    ordered_labels = [k for k, v in sorted(label_mapping.items(), key=lambda item: item[1])]
-    label_encoder = LabelEncoder()
-    label_encoder.classes_ = np.array(ordered_labels)
+    X_mean, input_std, label_encoder = load_preprocessing(MODEL_DIR)
+    initial_bundle = ModelBundle(bundle_version(MODEL_DIR, INFERENCE_MODE), MODEL_DIR, model, X_mean, input_std, label_encoder,
+                                 INFERENCE_MODE, COMPILED_INFERENCE)
+    initial_bundle.warm_up() # Trace and warm up before reporting ready, first /predict should not pay for it
     # Data loaded action
     send_serial(lcd_message="Data Loaded", voice_message="Preprocessing data loaded successfully.",
                 head_angle=35, head_hold_ms=2000,
                 handl_angle=20, handl_hold_ms=2000,
                 handr_angle=360, handr_hold_ms=2000)
 except Exception as e:
-    print(f"❌ Error loading audio preprocessing data or label encoder: {e}", file=sys.stderr)
+    logger.error(f"❌ Error loading audio preprocessing data or label encoder: {e}")
     # Data load error action
     send_serial(lcd_message="Data Error!", voice_message="Failed to load preprocessing data. Please check data files.",
                 head_angle=90, head_hold_ms=2000,
@@ -138,6 +188,20 @@ except Exception as e:
                 handr_angle=135, handr_hold_ms=2000)
     sys.exit(1)
 
+# Active model bundle. Requests read model_manager.current once and keep using
+# that bundle, so a reload never mixes weights and scaling from two versions.
+model_manager = ModelManager(
+    initial_bundle,
+    compiled=COMPILED_INFERENCE,
+    on_reload=lambda old, new: status_broadcaster.publish(
+        "model", {"version": new.version, "previous_version": old.version, "inference_mode": new.inference_mode}))
+status_broadcaster.publish("model", {"version": initial_bundle.version, "inference_mode": initial_bundle.inference_mode})
+# model_manager owns the bundle from here on. Drop the startup names so a hot reload
+# can free the first model, and nothing reads stale weights/scaling through them.
+del model, X_mean, input_std, label_encoder, initial_bundle
+if MODEL_WATCH_INTERVAL_SEC > 0:
+    model_manager.start_watcher(MODEL_WATCH_INTERVAL_SEC)
+
 # Directory for uploaded audio files
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -165,34 +229,38 @@ def convert_mp3_to_wav(mp3_path):
                     head_angle=90, head_hold_ms=2000,
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
-        print(f"❌ Error converting MP3 to WAV: {e}", file=sys.stderr)
+        logger.error(f"❌ Error converting MP3 to WAV: {e}")
         raise
 
 # Function to preprocess audio for model prediction
-def preprocess_audio(file_path):
+# Returns (features, skipped_fraction) where skipped_fraction is the share of audio dropped as silence
+def preprocess_audio(file_path, bundle):
     try:
         # Audio preprocessing start action
         send_serial(lcd_message="Preproc...", voice_message="Preprocessing audio features.",
                     head_angle=90, head_hold_ms=1500, # Head centered
                     handl_angle=45, handl_hold_ms=1500,
                     handr_angle=135, handr_hold_ms=1500)
-        y, sr = librosa.load(file_path, sr=22050) # Load audio, resample to 22050 Hz
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40) # Extract 40 MFCCs
-        mfcc_mean = np.mean(mfcc.T, axis=0) # Get mean of MFCCs
-        mfcc_scaled = (mfcc_mean - X_mean) / input_std # Scale using pre-calculated mean/std
+        y, sr = load_audio(file_path) # Load audio, resample to 22050 Hz
+        skipped_fraction = 0.0
+        if SKIP_SILENCE:
+            y, skipped_fraction = drop_silence(y, top_db=SILENCE_TOP_DB)
+            logger.info(f"🔇 Skipped {skipped_fraction * 100:.1f}% of audio as silence.")
+        mfcc_mean = compute_mfcc_mean(y, sr) # Mean of 40 MFCCs
+        features = bundle.scale(mfcc_mean) # Scale using the bundle's mean/std, add batch dimension
         # Audio features extracted action
         send_serial(lcd_message="Features OK", voice_message="Audio features extracted.",
                     head_angle=90, head_hold_ms=1800, # Head centered
                     handl_angle=45, handl_hold_ms=1800,
                     handr_angle=135, handr_hold_ms=1800)
-        return np.expand_dims(mfcc_scaled, axis=0) # Add batch dimension
+        return features, skipped_fraction
     except Exception as e:
         # Audio preprocessing error action
         send_serial(lcd_message="Preproc Err!", voice_message="Failed to preprocess audio.",
                     head_angle=90, head_hold_ms=2000,
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
-        print(f"❌ Error during audio preprocessing: {e}", file=sys.stderr)
+        logger.error(f"❌ Error during audio preprocessing: {e}")
         raise
 
 @app.route("/")
@@ -209,6 +277,8 @@ def index():
 def predict_route():
     """Handles audio file uploads, performs prediction, and returns results."""
     # This action is triggered by the frontend 'Analyze Audio' button submit
+    job_id = str(uuid.uuid4()) # Also used as the upload file name
+    status_broadcaster.publish("job", {"job_id": job_id, "state": "received"})
     # Prediction request received action
     send_serial(lcd_message="Predict Req", voice_message="Received prediction request.",
                 head_angle=90, head_hold_ms=1500, # Head centered, preparing for analysis
@@ -221,6 +291,7 @@ def predict_route():
                     head_angle=90, head_hold_ms=2000,
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "error", "error": "No file part"})
         return jsonify({"error": "No file part"}), 400
 
     file = request.files["file"]
@@ -230,6 +301,7 @@ def predict_route():
                     head_angle=90, head_hold_ms=2000,
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "error", "error": "No selected file"})
         return jsonify({"error": "No selected file"}), 400
 
     ext = os.path.splitext(file.filename)[1].lower()
@@ -239,9 +311,10 @@ def predict_route():
                     head_angle=90, head_hold_ms=2000,
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "error", "error": "Unsupported file type"})
         return jsonify({"error": "Unsupported file type. Please upload .wav or .mp3"}), 400
 
-    filename = f"{uuid.uuid4()}{ext}"
+    filename = f"{job_id}{ext}"
     path = os.path.join(UPLOAD_DIR, filename)
     file.save(path)
     # File saved action
@@ -251,20 +324,23 @@ def predict_route():
                 handr_angle=135, handr_hold_ms=1500)
 
     original_path = path # Keep track of the original path for cleanup
+    bundle = model_manager.current # Pin the model version for this whole request
 
     try:
         if ext == ".mp3":
             path = convert_mp3_to_wav(path) # Convert to WAV if MP3
 
-        features = preprocess_audio(path)
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "preprocessing"})
+        features, skipped_fraction = preprocess_audio(path, bundle)
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "predicting"})
         # Prediction started action
         send_serial(lcd_message="Predicting...", voice_message="Making a prediction.",
                     head_angle=90, head_hold_ms=2000, # Head centered, focused
                     handl_angle=45, handl_hold_ms=2000,
                     handr_angle=135, handr_hold_ms=2000)
-        preds = model.predict(features)[0]
+        preds = bundle.predict(features)
         predicted_index = int(np.argmax(preds))
-        label = label_encoder.inverse_transform([predicted_index])[0]
+        label = bundle.label_encoder.inverse_transform([predicted_index])[0]
         # Prediction complete action
         send_serial(lcd_message="Prediction Done", voice_message="Prediction complete.",
                     head_angle=90, head_hold_ms=1500, # Head centered
@@ -273,12 +349,15 @@ def predict_route():
 
         # Build confidences dict for all labels
         confidences = {
-            label_encoder.inverse_transform([i])[0]: float(preds[i])
+            bundle.label_encoder.inverse_transform([i])[0]: float(preds[i])
             for i in range(len(preds))
         }
 
         # Sort confidences by value in descending order
         sorted_confidences = dict(sorted(confidences.items(), key=lambda item: item[1], reverse=True))
+        status_broadcaster.publish("prediction", {"job_id": job_id, "prediction": label,
+                                                  "confidences": sorted_confidences,
+                                                  "model_version": bundle.version})
 
         # Action based on prediction result
         lcd_msg = f"Pred: {label}"
@@ -335,13 +414,18 @@ def predict_route():
                         handr_angle=135, handr_hold_ms=2000)
 
 
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "done"})
         return jsonify({
+            "job_id": job_id,
             "prediction": label,
-            "confidences": sorted_confidences
+            "confidences": sorted_confidences,
+            "model_version": bundle.version,
+            "silence_skipped": skipped_fraction
         })
 
     except Exception as e:
-        print(f"❌ Prediction error: {e}", file=sys.stderr)
+        logger.error(f"❌ Prediction error: {e}")
+        status_broadcaster.publish("job", {"job_id": job_id, "state": "error", "error": str(e)})
         # Prediction error action
         send_serial(lcd_message="Error!", voice_message="An error occurred during prediction.",
                     head_angle=90, head_hold_ms=2000,
@@ -371,7 +455,7 @@ def speak_route():
     data = request.get_json()
     message = data.get("message", "Hello from PneumoAI!")
     # The actual speak function itself calls send_serial, so no need for an extra send_serial here.
-    print(f"Flask received request to speak: {message}")
+    logger.info(f"Flask received request to speak: {message}")
     threading.Thread(target=speak, args=(message,)).start()
     return jsonify({"status": "speaking", "message": message})
 
@@ -403,6 +487,33 @@ def reset_servos_route():
                 handr_angle=0, handr_hold_ms=1000)
     return jsonify({"status": "servos reset to default"})
 
+# --- Batched UI events and status stream ---
+@app.route("/action/batch", methods=["POST"])
+def action_batch():
+    """
+    Accepts several UI events in one request, e.g.
+    {"events": [{"action": "ui_loaded", "lcd_message": "...", "head": 90, ...}, ...]}
+    (a bare JSON array works too). Events use the same fields as the /action/* routes.
+    Redundant LCD/servo updates are coalesced and the resulting robot command runs on
+    the background worker, so this returns immediately; follow progress on /events.
+    Every voice message is spoken, in order.
+    """
+    data = request.get_json(silent=True)
+    events = data.get("events") if isinstance(data, dict) else data
+    if not isinstance(events, list):
+        return jsonify({"error": "Expected a list of events"}), 400
+    kwargs, voice_messages, actions = coalesce_events(events, DEFAULT_HOLD_MS_COMMAND)
+    if kwargs is None:
+        return jsonify({"status": "ignored", "received": len(events), "actions": actions})
+    batch_id = robot_worker.submit(kwargs, voice_messages, actions)
+    return jsonify({"status": "queued", "batch_id": batch_id, "received": len(events), "actions": actions}), 202
+
+@app.route("/events")
+def events_stream():
+    """Server-sent events stream of robot, batch, job, prediction and model status."""
+    return Response(status_broadcaster.stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # --- Routes for specific UI actions (mapping to frontend buttons) ---
 @app.route("/action/ui_loaded", methods=["POST"])
 def action_ui_loaded():
@@ -570,10 +681,73 @@ def shutdown():
                 head_angle=0, head_hold_ms=1000, # Use 0 for reset as per new format
                 handl_angle=0, handl_hold_ms=1000,
                 handr_angle=0, handr_hold_ms=1000)
-    print("✅ Flask server shutting down...")
+    logger.info("✅ Flask server shutting down...")
     serial_comm.close() # Close serial port on shutdown
     return "Server shutting down..."
 
+@app.route("/admin/model", methods=["GET"])
+def admin_model_info():
+    """Returns the active model bundle version."""
+    bundle = model_manager.current
+    return jsonify({"version": bundle.version, "model_dir": bundle.model_dir,
+                    "inference_mode": bundle.inference_mode, "compiled": bundle.compiled,
+                    "loaded_at": bundle.loaded_at})
+
+@app.route("/admin/reload_model", methods=["POST"])
+def admin_reload_model():
+    """
+    Hot-reloads the model bundle without restarting the process.
+    Optional JSON body: {"model_dir": "models/v2", "inference_mode": "int8"} to switch
+    to another bundle directory or inference mode. model_dir must be MODEL_DIR or a
+    subdirectory of it, since loading a model file can run code from it.
+    In-flight predictions finish on the old bundle; new ones use the new bundle.
+    """
+    data = request.get_json(silent=True) or {}
+    model_dir = data.get("model_dir")
+    inference_mode = data.get("inference_mode")
+    if model_dir is not None:
+        # Resolve symlinks and ".." before checking the directory is inside MODEL_DIR
+        allowed_root = os.path.realpath(MODEL_DIR)
+        resolved_dir = os.path.realpath(str(model_dir))
+        if os.path.commonpath([allowed_root, resolved_dir]) != allowed_root:
+            logger.warning(f"⚠️ Rejected model reload from outside {MODEL_DIR}: {model_dir}")
+            return jsonify({"error": f"model_dir must be inside {MODEL_DIR}"}), 400
+        model_dir = resolved_dir
+    if inference_mode is not None and inference_mode not in INFERENCE_MODES:
+        return jsonify({"error": f"inference_mode must be one of {list(INFERENCE_MODES)}"}), 400
+    old_version = model_manager.current.version
+    try:
+        bundle = model_manager.reload(model_dir, inference_mode)
+    except Exception as e:
+        logger.error(f"❌ Model reload failed, keeping version {old_version}: {e}")
+        # Model reload error action
+        send_serial(lcd_message="Reload Error!", voice_message="Failed to reload the model. Keeping the current model.",
+                    head_angle=45, head_hold_ms=2000,
+                    handl_angle=90, handl_hold_ms=2000,
+                    handr_angle=23, handr_hold_ms=2000)
+        return jsonify({"error": str(e), "version": old_version}), 500
+    # Model reloaded action
+    send_serial(lcd_message="Model Reloaded", voice_message="New deep learning model is ready.",
+                head_angle=90, head_hold_ms=1500,
+                handl_angle=45, handl_hold_ms=1500,
+                handr_angle=135, handr_hold_ms=1500)
+    return jsonify({"status": "reloaded", "previous_version": old_version, "version": bundle.version,
+                    "inference_mode": bundle.inference_mode})
+
+@app.route("/admin/serial_log", methods=["GET", "POST"])
+def admin_serial_log():
+    """
+    GET dumps the ring buffer of recent serial traffic.
+    POST {"byte_trace": true/false} toggles per-byte tracing, {"clear": true} empties the buffer.
+    """
+    if request.method == "POST":
+        data = request.get_json(silent=True) or {}
+        if "byte_trace" in data:
+            enable_byte_trace(bool(data["byte_trace"]))
+        if data.get("clear"):
+            serial_traffic.clear()
+    return jsonify({"byte_trace": byte_trace_enabled(), "entries": serial_traffic.dump()})
+
 @app.route("/restart", methods=["POST"])
 def restart():
     """Restarts the application (Flask server and Pywebview)."""
@@ -582,8 +756,9 @@ def restart():
                 head_angle=0, head_hold_ms=1000, # Use 0 for reset as per new format
                 handl_angle=0, handl_hold_ms=1000,
                 handr_angle=0, handr_hold_ms=1000)
-    print("🔄 Restarting application...")
+    logger.info("🔄 Restarting application...")
     serial_comm.close() # Close serial port before restarting
+    shutdown_logging() # execl skips atexit, flush queued log records now
     # This will restart the entire Python process
     python = sys.executable
     os.execl(python, python, *sys.argv)
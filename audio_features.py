@@ -0,0 +1,81 @@
+# audio_features.py
+import os
+import numpy as np
+import librosa
+
+# Feature configuration the model was trained with
+SAMPLE_RATE = 22050 # Audio is resampled to 22050 Hz
+N_MFCC = 40 # Number of MFCC coefficients
+
+# Activity detection defaults. Frame and hop sizes are the MFCC STFT's n_fft / hop_length,
+# but energy frames are not centre padded like librosa's: frame i covers samples
+# [i * hop, i * hop + frame_length).
+ENERGY_FRAME_LENGTH = 2048
+ENERGY_HOP_LENGTH = 512
+SILENCE_TOP_DB = 40 # Frames this many dB below the loudest frame count as silence
+
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+
+
+def load_audio(file_path):
+    """Loads an audio file as mono float32 resampled to SAMPLE_RATE."""
+    y, sr = librosa.load(file_path, sr=SAMPLE_RATE)
+    return y, sr
+
+
+def mfcc_mean(y, sr=SAMPLE_RATE):
+    """Extracts N_MFCC MFCCs and averages them over all frames."""
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=N_MFCC)
+    return np.mean(mfcc.T, axis=0)
+
+
+def frame_energy(y, frame_length=ENERGY_FRAME_LENGTH, hop_length=ENERGY_HOP_LENGTH):
+    """Mean squared amplitude of every full frame, from one cumulative sum over the clip."""
+    n_frames = 1 + (len(y) - frame_length) // hop_length
+    cumulative = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+    starts = np.arange(n_frames) * hop_length
+    return (cumulative[starts + frame_length] - cumulative[starts]) / frame_length
+
+
+def drop_silence(y, top_db=SILENCE_TOP_DB, frame_length=ENERGY_FRAME_LENGTH, hop_length=ENERGY_HOP_LENGTH):
+    """
+    Removes silent / low-energy regions before feature extraction.
+    Returns (active_audio, skipped_fraction). Frames next to an active frame
+    are kept as well so onsets and decays of a sound are not clipped.
+    If the clip is too short or nothing is active, the audio is returned unchanged.
+    """
+    if len(y) < frame_length:
+        return y, 0.0
+    energy = frame_energy(y, frame_length, hop_length)
+    peak = np.max(energy)
+    if peak <= 0:
+        return y, 0.0
+    energy_db = 10.0 * np.log10(np.maximum(energy / peak, 1e-10))
+    active = energy_db > -top_db
+    active[1:] |= active[:-1].copy() # Keep one frame of context on each side
+    active[:-1] |= active[1:].copy()
+    if active.all():
+        return y, 0.0
+
+    # Sample mask covering every run of active frames, last frame extends to the end of the clip
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1 # Index of the last active frame of each run
+    keep = np.zeros(len(y), dtype=bool)
+    for first, last in zip(run_starts, run_ends):
+        end = len(y) if last == len(active) - 1 else last * hop_length + frame_length
+        keep[first * hop_length:end] = True
+    kept = int(np.count_nonzero(keep))
+    if kept < frame_length: # Not enough sound left for a meaningful MFCC
+        return y, 0.0
+    return y[keep], 1.0 - kept / len(y)
+
+
+def find_audio_files(root):
+    """Returns all audio files below root, sorted for reproducible runs."""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
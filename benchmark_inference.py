@@ -0,0 +1,74 @@
+# benchmark_inference.py
+# Measures per-call latency of a single (1, 40) prediction through
+# model.predict() (the old /predict path) and through CompiledModel, and
+# checks both give the same probabilities.
+#
+# Usage:
+#   python benchmark_inference.py [--model-dir models] [--calls 500] [--int8]
+import argparse
+import sys
+import time
+import numpy as np
+from model_bundle import (INFERENCE_FLOAT, INFERENCE_INT8, CompiledModel, load_model_file,
+                          load_preprocessing)
+
+
+def time_calls(fn, inputs):
+    """Returns per-call latencies in ms."""
+    latencies = []
+    for x in inputs:
+        start = time.perf_counter()
+        fn(x)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def summary(name, latencies, first_call_ms=None):
+    line = (f"{name:<22} mean {np.mean(latencies):8.3f} ms   p50 {np.percentile(latencies, 50):8.3f} ms   "
+            f"p95 {np.percentile(latencies, 95):8.3f} ms")
+    if first_call_ms is not None:
+        line += f"   first call {first_call_ms:9.1f} ms"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Keras predict() against the compiled call path.")
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--int8", action="store_true", help="Also time the int8 TFLite model")
+    args = parser.parse_args()
+
+    X_mean, _, _ = load_preprocessing(args.model_dir)
+    n_features = len(X_mean)
+    rng = np.random.default_rng(0)
+    inputs = [rng.standard_normal((1, n_features)).astype(np.float32) for _ in range(args.calls)]
+
+    model = load_model_file(args.model_dir, INFERENCE_FLOAT)
+
+    start = time.perf_counter()
+    model.predict(inputs[0], verbose=0)
+    predict_first_ms = (time.perf_counter() - start) * 1000.0
+    predict_lat = time_calls(lambda x: model.predict(x, verbose=0), inputs)
+
+    start = time.perf_counter()
+    compiled = CompiledModel(model, n_features) # Traces the graph
+    compiled.warm_up()
+    compiled_setup_ms = (time.perf_counter() - start) * 1000.0
+    compiled_lat = time_calls(compiled.predict, inputs)
+
+    max_diff = max(float(np.max(np.abs(model.predict(x, verbose=0) - compiled.predict(x)))) for x in inputs[:50])
+
+    print("\n=== Inference call path benchmark ===")
+    print(f"Calls: {args.calls} single-sample (1, {n_features}) predictions")
+    summary("model.predict()", predict_lat, predict_first_ms)
+    summary("CompiledModel", compiled_lat)
+    print(f"{'':<22} trace + warm-up at load time {compiled_setup_ms:.1f} ms")
+    if args.int8:
+        int8_model = load_model_file(args.model_dir, INFERENCE_INT8)
+        int8_model.predict(inputs[0])
+        summary("int8 TFLite", time_calls(int8_model.predict, inputs))
+    print(f"Speedup (mean):        {np.mean(predict_lat) / np.mean(compiled_lat):.1f}x")
+    print(f"Max |prob diff|:       {max_diff:.2e}")
+    if max_diff > 1e-5:
+        sys.exit("❌ CompiledModel output differs from model.predict()")
+    print("✅ CompiledModel matches model.predict().")
@@ -0,0 +1,93 @@
+# benchmark_mfcc.py
+# Checks MFCCEngine against librosa.feature.mfcc and compares per-clip throughput.
+#
+# Usage:
+#   python benchmark_mfcc.py --audio-dir data/holdout --batch-size 16
+#   python benchmark_mfcc.py --synthetic 64          # no recordings needed
+#   python benchmark_mfcc.py --synthetic 128 --short  # 0.5-2 s clips, where batching helps most
+import argparse
+import sys
+import time
+import numpy as np
+import librosa
+from audio_features import SAMPLE_RATE, N_MFCC, find_audio_files, load_audio
+from mfcc_engine import MFCCEngine, MFCC_TOLERANCE
+
+
+def synthetic_clips(count, min_sec=5, max_sec=20, seed=0):
+    """Noisy tones with quiet stretches, roughly like stethoscope recordings."""
+    rng = np.random.default_rng(seed)
+    clips = []
+    for _ in range(count):
+        n = int(SAMPLE_RATE * rng.uniform(min_sec, max_sec))
+        t = np.arange(n) / SAMPLE_RATE
+        y = 0.3 * np.sin(2 * np.pi * rng.uniform(80, 600) * t) + 0.05 * rng.standard_normal(n)
+        y[: n // 4] *= 0.01
+        clips.append(y.astype(np.float32))
+    return clips
+
+
+def check_parity(engine, clips):
+    """Returns the largest absolute differences (per frame, per clip mean) against librosa."""
+    frame_diff = mean_diff = 0.0
+    engine_means = engine.mfcc_mean_batch(clips)
+    for y, ours, our_mean in zip(clips, engine.mfcc_batch(clips), engine_means):
+        ref = librosa.feature.mfcc(y=y, sr=SAMPLE_RATE, n_mfcc=N_MFCC)
+        if ref.shape != ours.shape:
+            raise AssertionError(f"Shape mismatch: librosa {ref.shape}, engine {ours.shape}")
+        frame_diff = max(frame_diff, float(np.max(np.abs(ref - ours))))
+        mean_diff = max(mean_diff, float(np.max(np.abs(np.mean(ref.T, axis=0) - our_mean))))
+    return frame_diff, mean_diff
+
+
+def time_it(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MFCCEngine against librosa.")
+    parser.add_argument("--audio-dir", default=None, help="Directory of recordings to use")
+    parser.add_argument("--synthetic", type=int, default=32, help="Number of synthetic clips if no --audio-dir")
+    parser.add_argument("--short", action="store_true", help="Synthetic clips of 0.5-2 s instead of 5-20 s")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--fft-workers", type=int, default=1, help="scipy.fft threads, -1 for all cores")
+    parser.add_argument("--repeats", type=int, default=3, help="Best of N timed runs")
+    args = parser.parse_args()
+
+    if args.audio_dir:
+        clips = [load_audio(path)[0] for path in find_audio_files(args.audio_dir)]
+    else:
+        clips = synthetic_clips(args.synthetic, *((0.5, 2) if args.short else (5, 20)))
+    if not clips:
+        sys.exit("No clips to benchmark.")
+
+    start = time.perf_counter()
+    engine = MFCCEngine(fft_workers=args.fft_workers)
+    setup_ms = (time.perf_counter() - start) * 1000.0
+
+    frame_diff, mean_diff = check_parity(engine, clips)
+    batches = [clips[i:i + args.batch_size] for i in range(0, len(clips), args.batch_size)]
+    librosa_sec = time_it(lambda: [np.mean(librosa.feature.mfcc(y=y, sr=SAMPLE_RATE, n_mfcc=N_MFCC).T, axis=0)
+                                   for y in clips], args.repeats)
+    single_sec = time_it(lambda: [engine.mfcc_mean(y) for y in clips], args.repeats)
+    batch_sec = time_it(lambda: [engine.mfcc_mean_batch(b) for b in batches], args.repeats)
+
+    audio_sec = sum(len(y) for y in clips) / SAMPLE_RATE
+    print("\n=== MFCC engine benchmark ===")
+    print(f"Clips:              {len(clips)} ({audio_sec:.1f} s of audio), batch size {args.batch_size}")
+    print(f"Engine setup:       {setup_ms:.1f} ms (window, mel filterbank, DCT)")
+    print(f"Max |diff| frame:   {frame_diff:.2e} (tolerance {MFCC_TOLERANCE:.0e})")
+    print(f"Max |diff| mean:    {mean_diff:.2e}")
+    print(f"librosa per clip:   {librosa_sec / len(clips) * 1000:.2f} ms ({len(clips) / librosa_sec:.1f} clips/s)")
+    print(f"engine single:      {single_sec / len(clips) * 1000:.2f} ms ({len(clips) / single_sec:.1f} clips/s, "
+          f"{librosa_sec / single_sec:.2f}x)")
+    print(f"engine batched:     {batch_sec / len(clips) * 1000:.2f} ms ({len(clips) / batch_sec:.1f} clips/s, "
+          f"{librosa_sec / batch_sec:.2f}x)")
+    if max(frame_diff, mean_diff) > MFCC_TOLERANCE:
+        sys.exit(f"❌ MFCCEngine differs from librosa by more than {MFCC_TOLERANCE}")
+    print("✅ MFCCEngine matches librosa within tolerance.")
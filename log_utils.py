@@ -0,0 +1,162 @@
+# log_utils.py
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+LOGGER_NAME = "pneumoai"
+LOG_FORMAT = "%(asctime)s %(levelname)-5s [%(name)s] %(message)s"
+
+# Extra level below DEBUG for per-byte serial tracing
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+# Per-byte serial tracing is expensive and noisy, so it is off unless enabled here
+# (applied by setup_logging()) or at runtime with enable_byte_trace(True).
+# Lines sent/received are always logged at DEBUG.
+SERIAL_BYTE_TRACE = False
+
+_listener = None
+_stdout_handler = None
+_setup_lock = threading.Lock()
+_level_before_trace = None # Logger level to restore when byte tracing is turned off
+
+
+class _MaxLevelFilter(logging.Filter):
+    """Lets through only records below a level (keeps warnings off stdout)."""
+    def __init__(self, max_level):
+        super().__init__()
+        self.max_level = max_level
+
+    def filter(self, record):
+        return record.levelno < self.max_level
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Routes all `pneumoai.*` loggers through a queue to a background writer thread,
+    so callers only pay for putting a record on the queue. INFO and below go to
+    stdout, WARNING and above to stderr. Safe to call more than once.
+    """
+    global _listener, _stdout_handler, _level_before_trace
+    with _setup_lock:
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(level)
+        _level_before_trace = None # level is the one to restore from now on
+        _apply_byte_trace_level(logger)
+        if _listener is not None:
+            return logger
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        stdout_handler = logging.StreamHandler(sys.stdout)
+        stdout_handler.setFormatter(formatter)
+        stdout_handler.addFilter(_MaxLevelFilter(logging.WARNING))
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setFormatter(formatter)
+        stderr_handler.setLevel(logging.WARNING)
+        _stdout_handler = stdout_handler
+
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
+        _listener = logging.handlers.QueueListener(log_queue, stdout_handler, stderr_handler,
+                                                   respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging) # Drain the queue so the last messages are not lost
+        return logger
+
+
+def shutdown_logging():
+    """Stops the background writer after flushing all queued records."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def write_stdout_line(line):
+    """
+    Writes one line of protocol output (not logging) to the current sys.stdout,
+    so contextlib.redirect_stdout still captures it, and flushes it. The line and
+    its newline go out in a single write while holding the stdout log handler's
+    lock, so a log record from the writer thread can never land in the middle of it.
+    """
+    handler = _stdout_handler
+    if handler is None:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+        return
+    handler.acquire()
+    try:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+    finally:
+        handler.release()
+
+
+def get_logger(name):
+    """Returns a child of the application logger, e.g. get_logger("serial")."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def enable_byte_trace(enabled=True):
+    """
+    Turns per-byte serial tracing on or off at runtime. Enabling lowers the
+    logger level to TRACE if needed; disabling puts the previous level back so
+    DEBUG lines stop being written again.
+    """
+    global SERIAL_BYTE_TRACE
+    with _setup_lock:
+        SERIAL_BYTE_TRACE = enabled
+        _apply_byte_trace_level(logging.getLogger(LOGGER_NAME))
+
+
+def _apply_byte_trace_level(logger):
+    """Lowers the logger to TRACE while SERIAL_BYTE_TRACE is on, restores it when off. Caller holds _setup_lock."""
+    global _level_before_trace
+    if SERIAL_BYTE_TRACE:
+        if _level_before_trace is None and logger.getEffectiveLevel() > TRACE:
+            _level_before_trace = logger.level
+            logger.setLevel(TRACE)
+    elif _level_before_trace is not None:
+        logger.setLevel(_level_before_trace)
+        _level_before_trace = None
+
+
+def byte_trace_enabled():
+    return SERIAL_BYTE_TRACE
+
+
+class SerialTrafficBuffer:
+    """
+    Fixed-size ring buffer of recent serial traffic (sent commands, received
+    lines, timeouts and errors). Appending is O(1) and never does I/O, so it is
+    always on; the contents are only formatted when dump() is called.
+    """
+    def __init__(self, maxlen=500):
+        self._entries = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, direction, data):
+        """direction is e.g. "tx", "rx", "timeout" or "error"."""
+        with self._lock:
+            self._entries.append((time.time(), direction, data))
+
+    def dump(self):
+        """Returns the buffered entries, oldest first, as JSON-friendly dicts."""
+        with self._lock:
+            entries = list(self._entries)
+        return [{"time": t, "direction": d, "data": data} for t, d, data in entries]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared buffer for all serial traffic in this process
+serial_traffic = SerialTrafficBuffer()
@@ -0,0 +1,128 @@
+# mfcc_engine.py
+import numpy as np
+import scipy.fft
+import librosa
+from audio_features import SAMPLE_RATE, N_MFCC, load_audio, mfcc_mean
+
+# librosa.feature.mfcc defaults for the configuration the model was trained with
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+AMIN = 1e-10 # power_to_db amin
+TOP_DB = 80.0 # power_to_db top_db, applied per clip
+
+# Largest difference from librosa.feature.mfcc allowed by benchmark_mfcc.py, in MFCC units.
+# Both run in float32; the remaining difference is FFT rounding (typically below 1e-3
+# per frame and 1e-4 on clip means).
+MFCC_TOLERANCE = 1e-2
+
+
+def dct_matrix(n_out, n_in):
+    """Orthonormal DCT-II matrix, same as scipy.fft.dct(type=2, norm="ortho") truncated to n_out rows."""
+    n = np.arange(n_in)
+    k = np.arange(n_out)[:, np.newaxis]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+class MFCCEngine:
+    """
+    MFCC extractor specialised for SAMPLE_RATE / N_MFCC, matching
+    librosa.feature.mfcc(y=y, sr=SAMPLE_RATE, n_mfcc=N_MFCC) within MFCC_TOLERANCE.
+
+    The window, mel filterbank and DCT matrices are built once. Each clip is
+    zero-padded by n_fft // 2 on both sides (librosa's constant centre padding)
+    and the clips are packed back to back into one buffer. Frames of all clips
+    are gathered from that buffer in fixed-size blocks and STFT -> mel -> dB
+    runs on whole blocks, with the FFT spread over fft_workers threads.
+    """
+    def __init__(self, sr=SAMPLE_RATE, n_mfcc=N_MFCC, n_fft=N_FFT, hop_length=HOP_LENGTH,
+                 n_mels=N_MELS, block_frames=256, fft_workers=1):
+        self.sr = sr
+        self.n_mfcc = n_mfcc
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.block_frames = block_frames # Frames (over all clips) transformed at once, keeps blocks in cache
+        self.fft_workers = fft_workers # scipy.fft worker threads, -1 uses all cores (offline batches)
+        self.window = librosa.filters.get_window("hann", n_fft, fftbins=True).astype(np.float32)
+        # Transposed so a (frames, n_bins) power spectrum maps to (frames, n_mels) with one matmul
+        self.mel_basis_T = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).T.astype(np.float32)
+        self.dct_T = dct_matrix(n_mfcc, n_mels).T.astype(np.float32)
+
+    def n_frames(self, n_samples):
+        return 1 + n_samples // self.hop_length
+
+    def _log_mel_batch(self, clips):
+        """
+        Returns (log_mel, offsets): log_mel is (total real frames, n_mels) with the
+        frames of clip i in rows offsets[i]:offsets[i + 1], top_db clipping applied per clip.
+        """
+        lengths = np.array([len(y) for y in clips])
+        if len(clips) == 0 or np.any(lengths == 0):
+            raise ValueError("MFCCEngine needs at least one non-empty clip")
+        pad = self.n_fft // 2
+        clip_starts = np.concatenate(([0], np.cumsum(lengths + 2 * pad)))
+        buffer = np.zeros(clip_starts[-1], dtype=np.float32)
+        for i, y in enumerate(clips):
+            buffer[clip_starts[i] + pad:clip_starts[i] + pad + len(y)] = y
+
+        frame_counts = self.n_frames(lengths)
+        offsets = np.concatenate(([0], np.cumsum(frame_counts)))
+        clip_index = np.repeat(np.arange(len(clips)), frame_counts)
+        # Start sample of every real frame in the packed buffer
+        frame_starts = clip_starts[clip_index] + (np.arange(offsets[-1]) - offsets[clip_index]) * self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.n_fft)
+
+        log_mel = np.empty((offsets[-1], self.mel_basis_T.shape[1]), dtype=np.float32)
+        for start in range(0, offsets[-1], self.block_frames):
+            rows = slice(start, start + self.block_frames)
+            block = frames[frame_starts[rows]] * self.window
+            spectrum = scipy.fft.rfft(block, axis=-1, workers=self.fft_workers)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            log_mel[rows] = 10.0 * np.log10(np.maximum(AMIN, power @ self.mel_basis_T))
+
+        # top_db is relative to the loudest bin of each clip
+        peaks = np.maximum.reduceat(log_mel.max(axis=1), offsets[:-1])
+        np.maximum(log_mel, (peaks - TOP_DB)[clip_index, np.newaxis], out=log_mel)
+        return log_mel, offsets
+
+    def mfcc_batch(self, clips):
+        """Returns a list with one (n_mfcc, frames) array per clip, like librosa.feature.mfcc."""
+        log_mel, offsets = self._log_mel_batch(clips)
+        mfcc = log_mel @ self.dct_T
+        return [mfcc[offsets[i]:offsets[i + 1]].T for i in range(len(clips))]
+
+    def mfcc_mean_batch(self, clips):
+        """Returns (len(clips), n_mfcc) MFCCs averaged over each clip's frames."""
+        log_mel, offsets = self._log_mel_batch(clips)
+        # The DCT is linear, so pool the log-mel frames first and transform once per clip
+        pooled = np.add.reduceat(log_mel, offsets[:-1], axis=0) / np.diff(offsets)[:, np.newaxis]
+        return (pooled @ self.dct_T).astype(np.float32)
+
+    def mfcc_mean(self, y, sr=SAMPLE_RATE):
+        """Single clip drop-in for audio_features.mfcc_mean."""
+        if sr != self.sr:
+            raise ValueError(f"MFCCEngine was built for {self.sr} Hz audio, got {sr} Hz")
+        return self.mfcc_mean_batch([y])[0]
+
+
+# Production feature path. app.py and the offline tools (quantize_model.py,
+# quantization_parity.py, validate_silence_skip.py) all extract features through
+# compute_mfcc_mean(), so calibration and parity runs see what /predict sees.
+# Set to False to fall back to librosa.feature.mfcc everywhere.
+USE_MFCC_ENGINE = True
+_engine = MFCCEngine() if USE_MFCC_ENGINE else None # Window, mel filterbank and DCT built once
+
+
+def compute_mfcc_mean(y, sr=SAMPLE_RATE):
+    """Mean MFCC vector of a clip through MFCCEngine, or librosa if USE_MFCC_ENGINE is off."""
+    if _engine is None:
+        return mfcc_mean(y, sr)
+    return _engine.mfcc_mean(y, sr)
+
+
+def extract_mfcc_mean(file_path):
+    """Loads an audio file and returns its unscaled mean MFCC vector."""
+    y, sr = load_audio(file_path)
+    return compute_mfcc_mean(y, sr)
@@ -0,0 +1,296 @@
+# model_bundle.py
+import os
+import json
+import time
+import hashlib
+import threading
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+from sklearn.preprocessing import LabelEncoder
+from log_utils import get_logger
+
+logger = get_logger("model")
+
+# Files that together make up one versioned model bundle
+MODEL_FILE = "respiratory_model.h5"
+QUANTIZED_MODEL_FILE = "respiratory_model_int8.tflite" # Written by quantize_model.py
+X_MEAN_FILE = "X_mean.npy"
+INPUT_STD_FILE = "input_std.json"
+LABEL_MAPPING_FILE = "label_mapping.json"
+VERSION_FILE = "VERSION" # Optional, a single line with a human readable version
+PREPROCESSING_FILES = [X_MEAN_FILE, INPUT_STD_FILE, LABEL_MAPPING_FILE]
+
+# Inference modes selectable through configuration
+INFERENCE_FLOAT = "float" # Keras float32 model
+INFERENCE_INT8 = "int8" # TFLite model with int8 weights and activations
+INFERENCE_MODES = (INFERENCE_FLOAT, INFERENCE_INT8)
+
+
+def bundle_files(inference_mode=INFERENCE_FLOAT):
+    """Returns the files a bundle loads in the given inference mode, model file first."""
+    model_file = QUANTIZED_MODEL_FILE if inference_mode == INFERENCE_INT8 else MODEL_FILE
+    return [model_file] + PREPROCESSING_FILES
+
+
+def bundle_signature(model_dir, inference_mode=INFERENCE_FLOAT):
+    """
+    Returns a tuple of (size, mtime) for every file the bundle loads in this
+    inference mode, used by the watcher to notice that the files on disk have changed.
+    """
+    signature = []
+    for name in bundle_files(inference_mode) + [VERSION_FILE]:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            st = os.stat(path)
+            signature.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(signature)
+
+
+def bundle_version(model_dir, inference_mode=INFERENCE_FLOAT):
+    """
+    Uses the VERSION file if present, otherwise a short hash of the files the
+    bundle loads in this inference mode, so every distinct set of artifacts
+    gets a distinct version string.
+    """
+    version_path = os.path.join(model_dir, VERSION_FILE)
+    if os.path.exists(version_path):
+        with open(version_path) as f:
+            version = f.read().strip()
+        if version:
+            return version
+    digest = hashlib.sha1()
+    for name in bundle_files(inference_mode):
+        with open(os.path.join(model_dir, name), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class QuantizedModel:
+    """
+    Runs the int8 TFLite version of the respiratory model.
+    Exposes the same predict() call as a Keras model so the rest of the app
+    does not care which one it is using. Inputs are quantized and outputs
+    dequantized with the scale/zero point stored in the .tflite file.
+    """
+    def __init__(self, model_path, num_threads=1):
+        self.model_path = model_path
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+        self.lock = threading.Lock() # A TFLite interpreter must not be invoked from two threads at once
+
+    def _quantize(self, x):
+        scale, zero_point = self.input_details["quantization"]
+        dtype = self.input_details["dtype"]
+        if scale == 0: # Float input, nothing to do
+            return x.astype(dtype)
+        info = np.iinfo(dtype)
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, y):
+        scale, zero_point = self.output_details["quantization"]
+        if scale == 0:
+            return y.astype(np.float32)
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def predict(self, features, verbose=0):
+        features = np.asarray(features, dtype=np.float32)
+        outputs = []
+        with self.lock:
+            for row in features: # The converted model has a fixed batch size of 1
+                self.interpreter.set_tensor(self.input_details["index"], self._quantize(row[np.newaxis, :]))
+                self.interpreter.invoke()
+                outputs.append(self._dequantize(self.interpreter.get_tensor(self.output_details["index"]))[0])
+        return np.stack(outputs)
+
+
+class CompiledModel:
+    """
+    Graph-compiled single-sample call path for a Keras model.
+    model.predict() sets up a data adapter, callbacks and a step function on
+    every call, which costs far more than the math for a (1, n_features) input.
+    This traces model(x, training=False) once into a tf.function with a fixed
+    (1, n_features) float32 signature, so calls never retrace, and exposes the
+    same predict() call as a Keras model.
+    """
+    def __init__(self, model, n_features, jit_compile=False):
+        self.keras_model = model
+        self.n_features = n_features
+        self._call = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(1, n_features), dtype=tf.float32)],
+            jit_compile=jit_compile, # XLA, only worth it if the build supports it
+        )
+        self._call.get_concrete_function() # Trace now, at load time
+
+    def predict(self, features, verbose=0):
+        features = np.asarray(features, dtype=np.float32)
+        return np.stack([self._call(row[np.newaxis, :]).numpy()[0] for row in features])
+
+    def warm_up(self, runs=3):
+        """Runs a few dummy calls so kernels and allocations are ready before the first request."""
+        dummy = np.zeros((1, self.n_features), dtype=np.float32)
+        for _ in range(runs):
+            self._call(dummy)
+
+
+def load_model_file(model_dir, inference_mode=INFERENCE_FLOAT):
+    """Loads the model of a bundle for the given inference mode."""
+    if inference_mode == INFERENCE_FLOAT:
+        return load_model(os.path.join(model_dir, MODEL_FILE))
+    if inference_mode == INFERENCE_INT8:
+        return QuantizedModel(os.path.join(model_dir, QUANTIZED_MODEL_FILE))
+    raise ValueError(f"Unknown inference mode '{inference_mode}', expected one of {INFERENCE_MODES}")
+
+
+def load_preprocessing(model_dir):
+    """Loads X_mean, input_std and the label encoder of a bundle."""
+    X_mean = np.load(os.path.join(model_dir, X_MEAN_FILE))
+    with open(os.path.join(model_dir, INPUT_STD_FILE)) as f:
+        input_std = np.array(json.load(f))
+    with open(os.path.join(model_dir, LABEL_MAPPING_FILE)) as f:
+        label_mapping = json.load(f)
+    ordered_labels = [k for k, v in sorted(label_mapping.items(), key=lambda item: item[1])]
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(ordered_labels)
+    return X_mean, input_std, label_encoder
+
+
+class ModelBundle:
+    """
+    One consistent set of model weights, scaling statistics and labels.
+    A bundle is never modified after creation, so a request holding a
+    reference to it keeps a consistent view even if a reload happens.
+    """
+    def __init__(self, version, model_dir, model, X_mean, input_std, label_encoder,
+                 inference_mode=INFERENCE_FLOAT, compiled=True):
+        self.version = version
+        self.model_dir = model_dir
+        self.inference_mode = inference_mode
+        # Only the Keras model needs wrapping, the TFLite interpreter is already a compiled graph
+        if compiled and inference_mode == INFERENCE_FLOAT:
+            model = CompiledModel(model, len(X_mean))
+        self.model = model
+        self.compiled = isinstance(model, CompiledModel) # What actually serves, not what was asked for
+        self.X_mean = X_mean
+        self.input_std = input_std
+        self.label_encoder = label_encoder
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, model_dir, inference_mode=INFERENCE_FLOAT, compiled=True):
+        model = load_model_file(model_dir, inference_mode)
+        X_mean, input_std, label_encoder = load_preprocessing(model_dir)
+        return cls(bundle_version(model_dir, inference_mode), model_dir, model, X_mean, input_std, label_encoder,
+                   inference_mode, compiled)
+
+    def scale(self, mfcc_mean):
+        """Scales pooled MFCCs with this bundle's statistics and adds the batch dimension."""
+        return np.expand_dims((mfcc_mean - self.X_mean) / self.input_std, axis=0)
+
+    def predict(self, features):
+        """Returns the class probabilities for a single (1, n_features) input."""
+        return self.model.predict(features, verbose=0)[0]
+
+    def warm_up(self):
+        """
+        Runs dummy predictions so the first real request does not pay for graph
+        building, and checks the output matches the label set.
+        """
+        if isinstance(self.model, CompiledModel):
+            self.model.warm_up()
+        dummy = np.zeros((1, len(self.X_mean)), dtype=np.float32)
+        preds = self.predict(dummy)
+        if len(preds) != len(self.label_encoder.classes_):
+            raise ValueError(
+                f"Model outputs {len(preds)} classes but label mapping has "
+                f"{len(self.label_encoder.classes_)} labels."
+            )
+
+
+class ModelManager:
+    """
+    Holds the active ModelBundle and swaps it atomically on reload.
+    Callers take `manager.current` once per request and use that bundle
+    for the whole request; new requests pick up the new bundle.
+    """
+    def __init__(self, bundle, on_reload=None, compiled=True):
+        self._bundle = bundle
+        self.compiled = compiled # Requested for every reload; int8 bundles ignore it
+        self._lock = threading.Lock() # Guards the active bundle reference
+        self._reload_lock = threading.Lock() # Only one reload at a time
+        self._watcher_thread = None
+        self._stop_watching = threading.Event()
+        self.on_reload = on_reload # Optional callback(old_bundle, new_bundle)
+
+    @property
+    def current(self):
+        with self._lock:
+            return self._bundle
+
+    def reload(self, model_dir=None, inference_mode=None):
+        """
+        Loads and warms up a new bundle from model_dir (defaults to the current
+        bundle's directory and inference mode), then makes it active. On any
+        error the current bundle stays active and the exception is raised.
+        """
+        with self._reload_lock:
+            model_dir = model_dir or self.current.model_dir
+            inference_mode = inference_mode or self.current.inference_mode
+            new_bundle = ModelBundle.load(model_dir, inference_mode, self.compiled)
+            new_bundle.warm_up() # Warm up before the switch, outside the swap lock
+            with self._lock:
+                old_bundle = self._bundle
+                self._bundle = new_bundle
+            logger.info(f"🔁 Model bundle switched: {old_bundle.version} -> {new_bundle.version}")
+            if self.on_reload:
+                try:
+                    self.on_reload(old_bundle, new_bundle)
+                except Exception as e:
+                    logger.error(f"❌ Model reload callback error: {e}")
+            return new_bundle
+
+    def start_watcher(self, interval_sec=5.0):
+        """
+        Polls the active bundle directory and reloads when its files change.
+        A change is only picked up once the files have been stable for one
+        full interval, so a half-copied bundle is never loaded.
+        """
+        if self._watcher_thread and self._watcher_thread.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher_thread = threading.Thread(target=self._watch, args=(interval_sec,), daemon=True)
+        self._watcher_thread.start()
+
+    def stop_watcher(self):
+        self._stop_watching.set()
+
+    def _watch(self, interval_sec):
+        model_dir = self.current.model_dir
+        inference_mode = self.current.inference_mode
+        loaded_signature = bundle_signature(model_dir, inference_mode)
+        pending_signature = None
+        while not self._stop_watching.wait(interval_sec):
+            # Switched directory or mode via reload(model_dir, inference_mode)
+            if (self.current.model_dir, self.current.inference_mode) != (model_dir, inference_mode):
+                model_dir = self.current.model_dir
+                inference_mode = self.current.inference_mode
+                loaded_signature = bundle_signature(model_dir, inference_mode)
+                pending_signature = None
+                continue
+            signature = bundle_signature(model_dir, inference_mode)
+            if signature == loaded_signature:
+                pending_signature = None
+                continue
+            if signature != pending_signature:
+                pending_signature = signature # Wait one more interval for writes to settle
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"❌ Model watcher reload failed, keeping current bundle: {e}")
+            loaded_signature = signature # Don't retry the same broken files every interval
+            pending_signature = None
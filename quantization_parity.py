@@ -0,0 +1,180 @@
+# quantization_parity.py
+# Runs the float and int8 model bundles on a held-out set and reports label
+# agreement, confidence drift, latency and memory. Both are timed through
+# ModelBundle.predict(), the call /predict makes, so the float side uses the
+# same compiled call path as the app.
+#
+# Usage:
+#   python quantization_parity.py --holdout-dir data/holdout [--json report.json]
+#
+# If the held-out recordings are stored in sub folders named after the labels
+# (e.g. data/holdout/wheeze/xyz.wav) the accuracy of both models is reported too.
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from audio_features import find_audio_files
+from mfcc_engine import extract_mfcc_mean # Same features as /predict
+from model_bundle import (MODEL_FILE, QUANTIZED_MODEL_FILE, INFERENCE_FLOAT, INFERENCE_INT8,
+                          ModelBundle, CompiledModel, load_preprocessing)
+
+
+def keras_weight_bytes(model):
+    """Bytes of the Keras model's weights (the compiled wrapper holds the same weights)."""
+    if isinstance(model, CompiledModel):
+        model = model.keras_model
+    return int(sum(w.nbytes for w in model.get_weights()))
+
+
+def tflite_weight_bytes(quantized_model):
+    """
+    Bytes of the constant (weight and bias) tensors of the TFLite model.
+    Input tensors and tensors written by an op are activations, which the Keras
+    side does not count either, so they are left out. Telling them apart needs the
+    private Interpreter._get_ops_details(); returns None if this TF build lacks it,
+    and the report then compares file sizes only.
+    """
+    interpreter = quantized_model.interpreter
+    activations = {d["index"] for d in interpreter.get_input_details()}
+    try:
+        ops = interpreter._get_ops_details()
+    except AttributeError:
+        print("⚠️ This TensorFlow build has no Interpreter._get_ops_details(), "
+              "skipping the in-memory weight comparison.", file=sys.stderr)
+        return None
+    for op in ops:
+        activations.update(op["outputs"])
+    total = 0
+    for detail in interpreter.get_tensor_details():
+        if detail["index"] not in activations:
+            total += int(np.prod(detail["shape"])) * np.dtype(detail["dtype"]).itemsize
+    return total
+
+
+def time_predictions(bundle, features, repeats):
+    """Returns (probabilities, per-call latencies in ms) for single-row bundle.predict() calls."""
+    probs = []
+    latencies = []
+    for row in features:
+        row = row[np.newaxis, :]
+        for _ in range(repeats):
+            start = time.perf_counter()
+            out = bundle.predict(row)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        probs.append(out)
+    return np.array(probs), np.array(latencies)
+
+
+def latency_summary(latencies):
+    return {
+        "mean_ms": float(np.mean(latencies)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def run_parity(model_dir, holdout_dir, repeats=5):
+    X_mean, input_std, label_encoder = load_preprocessing(model_dir)
+    labels = list(label_encoder.classes_)
+
+    paths, features, true_labels = [], [], []
+    for path in find_audio_files(holdout_dir):
+        try:
+            features.append((extract_mfcc_mean(path) - X_mean) / input_std)
+        except Exception as e:
+            print(f"❌ Skipping {path}: {e}", file=sys.stderr)
+            continue
+        paths.append(path)
+        parent = os.path.basename(os.path.dirname(path))
+        true_labels.append(parent if parent in labels else None)
+    if not features:
+        raise RuntimeError(f"No usable audio files found in {holdout_dir}")
+    features = np.array(features, dtype=np.float32)
+
+    # Loaded and warmed up the same way app.py does it, warm-up is not timed
+    float_bundle = ModelBundle.load(model_dir, INFERENCE_FLOAT)
+    int8_bundle = ModelBundle.load(model_dir, INFERENCE_INT8)
+    float_bundle.warm_up()
+    int8_bundle.warm_up()
+    float_probs, float_lat = time_predictions(float_bundle, features, repeats)
+    int8_probs, int8_lat = time_predictions(int8_bundle, features, repeats)
+
+    float_pred = np.argmax(float_probs, axis=1)
+    int8_pred = np.argmax(int8_probs, axis=1)
+    top_drift = np.abs(float_probs[np.arange(len(features)), float_pred] -
+                       int8_probs[np.arange(len(features)), float_pred])
+    all_drift = np.abs(float_probs - int8_probs)
+
+    report = {
+        "samples": int(len(features)),
+        "label_agreement": float(np.mean(float_pred == int8_pred)),
+        "disagreements": [
+            {"file": paths[i], "float": labels[float_pred[i]], "int8": labels[int8_pred[i]]}
+            for i in np.flatnonzero(float_pred != int8_pred)
+        ],
+        "confidence_drift": {
+            "top_class_mean_abs": float(np.mean(top_drift)),
+            "top_class_max_abs": float(np.max(top_drift)),
+            "all_classes_mean_abs": float(np.mean(all_drift)),
+        },
+        "latency": {
+            "float": latency_summary(float_lat),
+            "int8": latency_summary(int8_lat),
+            "speedup_mean": float(np.mean(float_lat) / np.mean(int8_lat)),
+        },
+        "memory": {
+            "float_file_bytes": os.path.getsize(os.path.join(model_dir, MODEL_FILE)),
+            "int8_file_bytes": os.path.getsize(os.path.join(model_dir, QUANTIZED_MODEL_FILE)),
+            "float_weight_bytes": keras_weight_bytes(float_bundle.model),
+            "int8_weight_bytes": tflite_weight_bytes(int8_bundle.model),
+        },
+    }
+
+    labelled = [i for i, t in enumerate(true_labels) if t is not None]
+    if labelled:
+        truth = np.array([labels.index(true_labels[i]) for i in labelled])
+        report["accuracy"] = {
+            "labelled_samples": len(labelled),
+            "float": float(np.mean(float_pred[labelled] == truth)),
+            "int8": float(np.mean(int8_pred[labelled] == truth)),
+        }
+    return report
+
+
+def print_report(report):
+    lat, mem, drift = report["latency"], report["memory"], report["confidence_drift"]
+    print("\n=== Quantization parity report ===")
+    print(f"Samples:            {report['samples']}")
+    print(f"Label agreement:    {report['label_agreement'] * 100:.2f}%")
+    print(f"Top-class drift:    mean {drift['top_class_mean_abs']:.4f}, max {drift['top_class_max_abs']:.4f}")
+    print(f"All-class drift:    mean {drift['all_classes_mean_abs']:.4f}")
+    if "accuracy" in report:
+        acc = report["accuracy"]
+        print(f"Accuracy ({acc['labelled_samples']} labelled): float {acc['float'] * 100:.2f}%, "
+              f"int8 {acc['int8'] * 100:.2f}%")
+    print(f"Latency float:      mean {lat['float']['mean_ms']:.3f} ms, p95 {lat['float']['p95_ms']:.3f} ms")
+    print(f"Latency int8:       mean {lat['int8']['mean_ms']:.3f} ms, p95 {lat['int8']['p95_ms']:.3f} ms")
+    print(f"Speedup (mean):     {lat['speedup_mean']:.2f}x")
+    print(f"Model file:         float {mem['float_file_bytes'] / 1024:.1f} KiB, int8 {mem['int8_file_bytes'] / 1024:.1f} KiB")
+    if mem["int8_weight_bytes"] is not None:
+        print(f"Weights in memory:  float {mem['float_weight_bytes'] / 1024:.1f} KiB, "
+              f"int8 {mem['int8_weight_bytes'] / 1024:.1f} KiB")
+    for d in report["disagreements"]:
+        print(f"  ≠ {d['file']}: float={d['float']} int8={d['int8']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare float and int8 respiratory models.")
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--holdout-dir", required=True, help="Directory of held-out audio files")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed predictions per sample")
+    parser.add_argument("--json", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    result = run_parity(args.model_dir, args.holdout_dir, args.repeats)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
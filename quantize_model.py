@@ -0,0 +1,69 @@
+# quantize_model.py
+# Converts models/respiratory_model.h5 to a fully int8 TFLite model
+# (weights and activations) for the INFERENCE_INT8 mode in app.py.
+#
+# Usage:
+#   python quantize_model.py --calibration-dir data/calibration
+#
+# The calibration directory should hold a few hundred representative .wav/.mp3
+# recordings (not the held-out set used by quantization_parity.py).
+import argparse
+import os
+import sys
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+from audio_features import find_audio_files
+from mfcc_engine import extract_mfcc_mean # Same features as /predict
+from model_bundle import MODEL_FILE, QUANTIZED_MODEL_FILE, load_preprocessing
+
+
+def calibration_features(model_dir, calibration_dir, max_samples):
+    """Builds scaled (1, 40) feature rows from the calibration recordings."""
+    X_mean, input_std, _ = load_preprocessing(model_dir)
+    features = []
+    for path in find_audio_files(calibration_dir)[:max_samples]:
+        try:
+            features.append((extract_mfcc_mean(path) - X_mean) / input_std)
+        except Exception as e:
+            print(f"❌ Skipping {path}: {e}", file=sys.stderr)
+    if not features:
+        raise RuntimeError(f"No usable audio files found in {calibration_dir}")
+    return np.array(features, dtype=np.float32)
+
+
+def quantize(model_dir, calibration_dir, max_samples=300):
+    model = load_model(os.path.join(model_dir, MODEL_FILE))
+    samples = calibration_features(model_dir, calibration_dir, max_samples)
+    print(f"Calibrating on {len(samples)} samples...")
+
+    def representative_dataset():
+        for row in samples:
+            yield [row[np.newaxis, :]]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    # Full integer quantization: fail instead of silently falling back to float ops
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    tflite_model = converter.convert()
+
+    out_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE)
+    with open(out_path, "wb") as f:
+        f.write(tflite_model)
+    float_size = os.path.getsize(os.path.join(model_dir, MODEL_FILE))
+    print(f"✅ Wrote {out_path} ({len(tflite_model) / 1024:.1f} KiB, float model {float_size / 1024:.1f} KiB)")
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize the respiratory model to int8 TFLite.")
+    parser.add_argument("--model-dir", default="models")
+    # Required: activation ranges calibrated on anything but real recordings would be
+    # written into the bundle the app serves
+    parser.add_argument("--calibration-dir", required=True, help="Directory of representative audio files")
+    parser.add_argument("--max-samples", type=int, default=300)
+    args = parser.parse_args()
+    quantize(args.model_dir, args.calibration_dir, args.max_samples)
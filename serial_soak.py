@@ -0,0 +1,141 @@
+# serial_soak.py
+# Benchmarks and soak-tests the real SerialCommunicator and rfid_reader.py code
+# against virtual_arduino.py on a plain Linux box.
+#
+# Usage:
+#   python serial_soak.py --commands 500 --threads 4 --rfid-runs 5
+#   python serial_soak.py --duration 3600 --drop-rate 0.01 --garble-rate 0.01   # soak with faults
+import argparse
+import json
+import threading
+import time
+import numpy as np
+from log_utils import setup_logging
+from serial_utils import SerialCommunicator
+from rfid_reader import send_and_receive_rfid_data
+from virtual_arduino import VirtualArduino
+
+# Held across send + read so concurrent workers don't steal each other's acks
+# (SerialCommunicator locks each call separately).
+comm_exchange_lock = threading.Lock()
+
+
+def command_worker(comm, worker_id, args, deadline, results, results_lock):
+    """Sends lcd + servo pairs and waits for each ack, like send_serial() does in app.py."""
+    latencies, timeouts, errors, sent = [], 0, 0, 0
+    i = 0
+    while (args.duration and time.time() < deadline) or (not args.duration and i < args.commands):
+        if i % 2 == 0:
+            command, expected = f"lcd:W{worker_id} #{i}\n", "ack:lcd"
+        else:
+            h = args.servo_hold_ms
+            command, expected = f"servo:90,{h};45,{h};135,{h}\n", "ack:servo"
+        with comm_exchange_lock:
+            start = time.perf_counter()
+            comm.send(command)
+            reply = comm.read_response(timeout_sec=args.reply_timeout)
+            elapsed = (time.perf_counter() - start) * 1000.0
+        sent += 1
+        if reply is None:
+            timeouts += 1
+        elif reply != expected:
+            errors += 1
+        else:
+            latencies.append(elapsed)
+        i += 1
+    with results_lock:
+        results["latencies_ms"].extend(latencies)
+        results["sent"] += sent
+        results["timeouts"] += timeouts
+        results["bad_replies"] += errors
+
+
+def run_commands(port, args):
+    comm = SerialCommunicator(port=port, baudrate=args.baudrate, enabled=True)
+    if not comm.enabled:
+        raise RuntimeError(f"Could not open virtual port {port}")
+    results = {"latencies_ms": [], "sent": 0, "timeouts": 0, "bad_replies": 0}
+    results_lock = threading.Lock()
+    deadline = time.time() + args.duration if args.duration else None
+    threads = [threading.Thread(target=command_worker,
+                                args=(comm, n, args, deadline, results, results_lock))
+               for n in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    comm.close()
+
+    lat = np.array(results["latencies_ms"]) if results["latencies_ms"] else np.zeros(1)
+    return {
+        "sent": results["sent"],
+        "ok": len(results["latencies_ms"]),
+        "timeouts": results["timeouts"],
+        "bad_replies": results["bad_replies"],
+        "wall_sec": wall,
+        "commands_per_sec": results["sent"] / wall,
+        "round_trip_ms": {"mean": float(np.mean(lat)), "p50": float(np.percentile(lat, 50)),
+                          "p95": float(np.percentile(lat, 95)), "max": float(np.max(lat))},
+    }
+
+
+def run_rfid(port, args):
+    statuses = {}
+    durations = []
+    for _ in range(args.rfid_runs):
+        start = time.perf_counter()
+        value = send_and_receive_rfid_data(port, args.baudrate, "rfid:auth\n")
+        durations.append(time.perf_counter() - start)
+        status = ":".join(value.split(":")[:2]) if value else "missing" # e.g. rfid:success:DE:AD:BE:EF
+        statuses[status] = statuses.get(status, 0) + 1
+    return {"runs": args.rfid_runs, "statuses": statuses,
+            "mean_sec": float(np.mean(durations)) if durations else 0.0,
+            "note": "includes the 2 s connection settle sleep in rfid_reader.py"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load/soak test the serial stack against a virtual Arduino.")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--commands", type=int, default=200, help="Commands per thread (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=0, help="Soak for this many seconds instead")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--servo-hold-ms", type=int, default=20)
+    parser.add_argument("--reply-timeout", type=float, default=2.0)
+    parser.add_argument("--rfid-runs", type=int, default=3)
+    parser.add_argument("--rfid-result", choices=["success", "failed", "timeout"], default="success")
+    parser.add_argument("--ack-latency-ms", type=float, default=5)
+    parser.add_argument("--rfid-latency-ms", type=float, default=800)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--garble-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    setup_logging()
+    device = VirtualArduino(baudrate=args.baudrate, ack_latency_ms=args.ack_latency_ms,
+                            rfid_latency_ms=args.rfid_latency_ms, rfid_result=args.rfid_result,
+                            drop_rate=args.drop_rate, garble_rate=args.garble_rate,
+                            latency_jitter_ms=args.latency_jitter_ms, seed=args.seed)
+    with device:
+        report = {"commands": run_commands(device.port, args)}
+        if args.rfid_runs:
+            report["rfid"] = run_rfid(device.port, args)
+        report["device"] = dict(device.stats)
+
+    c = report["commands"]
+    print("\n=== Serial soak report ===")
+    print(f"Baud rate:        {args.baudrate}, threads {args.threads}")
+    print(f"Commands:         {c['sent']} sent, {c['ok']} acked, {c['timeouts']} timeouts, {c['bad_replies']} bad replies")
+    print(f"Throughput:       {c['commands_per_sec']:.1f} commands/s over {c['wall_sec']:.1f} s")
+    print(f"Round trip:       mean {c['round_trip_ms']['mean']:.2f} ms, p95 {c['round_trip_ms']['p95']:.2f} ms, "
+          f"max {c['round_trip_ms']['max']:.2f} ms")
+    if "rfid" in report:
+        r = report["rfid"]
+        print(f"RFID:             {r['statuses']} over {r['runs']} runs, mean {r['mean_sec']:.2f} s ({r['note']})")
+    print(f"Device:           {report['device']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -2,7 +2,9 @@
 import serial
 import time
 import threading
-import sys
+from log_utils import get_logger, byte_trace_enabled, serial_traffic, TRACE
+
+logger = get_logger("serial")
 
 class SerialCommunicator:
     def __init__(self, port, baudrate, enabled=True):
@@ -16,61 +18,66 @@ class SerialCommunicator:
             try:
                 self.ser = serial.Serial(self.port, self.baudrate, timeout=0.05)
                 time.sleep(2) # Give time for connection to establish
-                print(f"✅ Serial port {self.port} opened successfully.")
+                logger.info(f"✅ Serial port {self.port} opened successfully.")
             except serial.SerialException as e:
                 self.enabled = False # Disable if connection fails
-                print(f"❌ Could not open serial port {self.port}: {e}", file=sys.stderr)
-                print("Serial communication disabled. Running in simulation mode.", file=sys.stderr)
+                logger.error(f"❌ Could not open serial port {self.port}: {e}")
+                logger.warning("Serial communication disabled. Running in simulation mode.")
 
     def send(self, data):
         """
         Sends data over the serial port exactly as provided.
-        Prints exact string sent for debugging.
+        Logs the exact string sent and records it in the serial traffic buffer.
         """
         if not self.enabled:
             # Use repr() to show exact string including newlines in simulated output
-            print(f"[SERIAL SIMULATED SEND] {repr(data)}")
+            logger.debug("[SERIAL SIMULATED SEND] %r", data)
+            serial_traffic.record("tx-simulated", data)
             return
 
         with self.lock:
             try:
                 if self.ser and self.ser.is_open:
                     self.ser.write(data.encode('utf-8'))
+                    serial_traffic.record("tx", data)
                     # Use repr() to show exact string including newlines in actual sent output
-                    print(f"[SERIAL SENT] {repr(data)}")
+                    logger.debug("[SERIAL SENT] %r", data)
                 else:
-                    print(f"❌ Serial port is not open. Cannot send data: {repr(data)}", file=sys.stderr)
+                    logger.error(f"❌ Serial port is not open. Cannot send data: {data!r}")
             except serial.SerialException as e:
-                print(f"❌ Error sending data over serial: {e}", file=sys.stderr)
+                serial_traffic.record("error", str(e))
+                logger.error(f"❌ Error sending data over serial: {e}")
                 self.enabled = False # Disable if send fails
-                print("Serial communication disabled due to error.", file=sys.stderr)
+                logger.warning("Serial communication disabled due to error.")
 
     def read_response(self, timeout_sec=5, expected_end_char='\n'):
         """
         Reads data from the serial port until an expected end character is found
-        or a timeout occurs. Prints all incoming raw bytes for debugging.
+        or a timeout occurs. Incoming bytes are only traced when byte tracing is
+        enabled in log_utils; complete lines always go to the traffic buffer.
         Returns the decoded line or None on timeout/error.
         """
         if not self.enabled:
-            print(f"[SERIAL SIMULATED READ] Waiting for response (timeout {timeout_sec}s)...")
+            logger.debug("[SERIAL SIMULATED READ] Waiting for response (timeout %ss)...", timeout_sec)
             return None
 
         start_time = time.time()
         current_line_buffer = ""
-        print("\n--- Incoming Serial Data (Raw Bytes) ---")
+        trace = byte_trace_enabled() # Checked once per read, not per byte
 
         with self.lock: # Lock during read operation
             while (time.time() - start_time) < timeout_sec:
                 if self.ser and self.ser.in_waiting > 0:
                     raw_byte = self.ser.read(1)  # Read one byte at a time
-                    sys.stdout.write(f"\\x{raw_byte.hex()}")
-                    sys.stdout.flush() # Ensure it prints immediately
+                    if trace:
+                        logger.log(TRACE, "[SERIAL RX BYTE] \\x%s", raw_byte.hex())
 
                     try:
                         char = raw_byte.decode('ascii')
                         if char == expected_end_char:
                             processed_line = current_line_buffer.strip()
-                            print(f"\n[SERIAL RECEIVED LINE] '{processed_line}'")
+                            serial_traffic.record("rx", processed_line)
+                            logger.debug("[SERIAL RECEIVED LINE] '%s'", processed_line)
                             return processed_line
                         elif char == '\r': # Ignore carriage return
                             pass
@@ -79,15 +86,17 @@ class SerialCommunicator:
                     except UnicodeDecodeError:
                         current_line_buffer += f"\\x{raw_byte.hex()}"
                     except serial.SerialException as e:
-                        print(f"\n❌ Error reading from serial: {e}", file=sys.stderr)
+                        serial_traffic.record("error", str(e))
+                        logger.error(f"❌ Error reading from serial: {e}")
                         self.enabled = False
                         return None
                 time.sleep(0.01) # Small delay
 
-        print(f"\n[SERIAL TIMEOUT] No full response line received within {timeout_sec} seconds.")
+        serial_traffic.record("timeout", current_line_buffer)
+        logger.warning(f"[SERIAL TIMEOUT] No full response line received within {timeout_sec} seconds.")
         return None
 
     def close(self):
         if self.ser and self.ser.is_open:
-            print(f"Closing serial port {self.port}.")
+            logger.info(f"Closing serial port {self.port}.")
             self.ser.close()
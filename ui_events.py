@@ -0,0 +1,201 @@
+# ui_events.py
+import json
+import queue
+import threading
+import time
+import uuid
+from log_utils import get_logger
+
+logger = get_logger("events")
+
+# LCD text of a UI event, the last one wins
+LCD_KEY = "lcd_message"
+# Servo keys of a UI event and the send_serial() keyword arguments they map onto.
+# They form one servo command: the last event with any of them sets all six.
+SERVO_EVENT_KEYS = {
+    "head": "head_angle",
+    "head_hold_ms": "head_hold_ms",
+    "handl": "handl_angle",
+    "handl_hold_ms": "handl_hold_ms",
+    "handr": "handr_angle",
+    "handr_hold_ms": "handr_hold_ms",
+}
+# Voice messages are never merged, each one is spoken
+VOICE_KEY = "voice_message"
+SERVO_KEYS = ("head_angle", "head_hold_ms", "handl_angle", "handl_hold_ms", "handr_angle", "handr_hold_ms")
+DEFAULT_SERVO_ANGLE = 0 # What send_serial() uses for a missing angle
+
+
+def servo_command(event, default_hold_ms):
+    """
+    Returns the complete send_serial() servo arguments of one event, with
+    send_serial()'s defaults for missing fields (angle 0, default_hold_ms),
+    or None if the event has no servo fields.
+    """
+    if all(event.get(event_key) is None for event_key in SERVO_EVENT_KEYS):
+        return None
+    command = {}
+    for event_key, kwarg in SERVO_EVENT_KEYS.items():
+        value = event.get(event_key)
+        if value is None:
+            value = default_hold_ms if kwarg.endswith("_hold_ms") else DEFAULT_SERVO_ANGLE
+        command[kwarg] = value
+    return command
+
+
+def _append_voice(voice_messages, message):
+    """Queues a voice message unless it repeats the one right before it."""
+    if message and (not voice_messages or voice_messages[-1] != message):
+        voice_messages.append(message)
+
+
+def coalesce_events(events, default_hold_ms):
+    """
+    Merges a list of UI events into one robot command.
+    The LCD only ever shows the last message. The servos end up where the last
+    event with any servo field sends them, exactly as if that event had been sent
+    on its own (missing angles 0, missing holds default_hold_ms), so an angle is
+    never paired with a hold time from another event.
+    Voice messages all play, in order, with back-to-back repeats spoken once.
+    Returns (send_serial_kwargs, voice_messages, actions), with kwargs None if
+    nothing to do.
+    """
+    merged = {}
+    voice_messages = []
+    actions = []
+    found = False
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        actions.append(event.get("action"))
+        if event.get(LCD_KEY) is not None:
+            merged[LCD_KEY] = event[LCD_KEY]
+            found = True
+        servos = servo_command(event, default_hold_ms)
+        if servos is not None:
+            merged.update(servos) # Replaces all six servo arguments at once
+            found = True
+        if event.get(VOICE_KEY):
+            _append_voice(voice_messages, event[VOICE_KEY])
+            found = True
+    return (merged if found else None), voice_messages, actions
+
+
+class StatusBroadcaster:
+    """
+    Fan-out of status updates to server-sent-events clients.
+    Keeps the latest payload per event type so a new client immediately gets
+    the current robot/batch/job/prediction/model state. Slow clients never block
+    publishers: their bounded queue drops the oldest update instead.
+    """
+    def __init__(self, max_queue=100):
+        self._subscribers = set()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.max_queue = max_queue
+
+    def publish(self, event_type, data):
+        message = (event_type, dict(data, time=time.time()))
+        with self._lock:
+            self._latest[event_type] = message
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                try:
+                    q.get_nowait() # Drop the oldest update for this slow client
+                    q.put_nowait(message)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            for message in self._latest.values():
+                q.put_nowait(message)
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def stream(self, heartbeat_sec=15.0):
+        """Generator of text/event-stream chunks for one client."""
+        q = self.subscribe()
+        try:
+            while True:
+                try:
+                    event_type, data = q.get(timeout=heartbeat_sec)
+                except queue.Empty:
+                    yield ": keep-alive\n\n" # Comment line, keeps proxies and the webview from timing out
+                    continue
+                yield f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            self.unsubscribe(q)
+
+
+class RobotCommandWorker:
+    """
+    Runs robot (LCD/servo/voice) commands on one background thread so HTTP
+    handlers return without waiting for servo hold times. LCD/servo commands
+    that pile up while the robot is busy are coalesced into a single command
+    before they are executed. Voice messages go to a second thread that speaks
+    them one after another in the order they were submitted.
+    """
+    def __init__(self, execute, broadcaster, speak):
+        self.execute = execute # Callable taking send_serial() keyword arguments
+        self.broadcaster = broadcaster
+        self.speak = speak # Blocking callable taking one voice message
+        self._queue = queue.Queue()
+        self._voice_queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._voice_thread = threading.Thread(target=self._run_voice, daemon=True)
+        self._voice_thread.start()
+
+    def submit(self, kwargs, voice_messages, actions):
+        """kwargs come from coalesce_events(): LCD text and/or a complete servo command."""
+        batch_id = str(uuid.uuid4())
+        self._queue.put((batch_id, kwargs, voice_messages, actions))
+        return batch_id
+
+    def _run_voice(self):
+        while True:
+            message = self._voice_queue.get()
+            try:
+                self.speak(message)
+            except Exception as e:
+                logger.error(f"❌ Robot voice error: {e}")
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            while True: # Drain everything queued while the last command was running
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            merged = {}
+            voice_messages = []
+            actions = []
+            for _, kwargs, batch_voice, batch_actions in pending:
+                merged.update(kwargs) # Servo commands are complete, so a later one replaces all six fields
+                for message in batch_voice:
+                    _append_voice(voice_messages, message)
+                actions.extend(batch_actions)
+            batch_ids = [batch_id for batch_id, _, _, _ in pending]
+
+            # Robot busy/idle is published by execute (send_serial) itself
+            self.broadcaster.publish("batch", {"state": "running", "lcd_message": merged.get("lcd_message"),
+                                               "servos": {k: merged.get(k) for k in SERVO_KEYS},
+                                               "actions": actions, "batch_ids": batch_ids})
+            try:
+                self.execute(**merged)
+            except Exception as e:
+                logger.error(f"❌ Robot command error: {e}")
+            for message in voice_messages: # Spoken after the move, like send_serial() does
+                self._voice_queue.put(message)
+            self.broadcaster.publish("batch", {"state": "done", "lcd_message": merged.get("lcd_message"),
+                                               "batch_ids": batch_ids})
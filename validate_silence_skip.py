@@ -0,0 +1,103 @@
+# validate_silence_skip.py
+# Compares the full-clip MFCC path with the silence-skipping path (SKIP_SILENCE in app.py)
+# on a directory of recordings: fraction of audio skipped, feature extraction
+# throughput and how often the predicted label changes.
+#
+# Usage:
+#   python validate_silence_skip.py --audio-dir data/holdout [--top-db 40] [--json report.json]
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from audio_features import SILENCE_TOP_DB, find_audio_files, load_audio, drop_silence
+from mfcc_engine import compute_mfcc_mean # Same features as /predict
+from model_bundle import INFERENCE_FLOAT, ModelBundle
+
+
+def run_validation(model_dir, audio_dir, top_db=SILENCE_TOP_DB, inference_mode=INFERENCE_FLOAT):
+    bundle = ModelBundle.load(model_dir, inference_mode)
+    bundle.warm_up()
+    labels = bundle.label_encoder.classes_
+
+    rows = []
+    full_time = skip_time = 0.0
+    audio_seconds = 0.0
+    for path in find_audio_files(audio_dir):
+        try:
+            y, sr = load_audio(path) # Decoding is the same for both paths, not timed
+        except Exception as e:
+            print(f"❌ Skipping {path}: {e}", file=sys.stderr)
+            continue
+        audio_seconds += len(y) / sr
+
+        start = time.perf_counter()
+        full_features = compute_mfcc_mean(y, sr)
+        full_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        active, skipped = drop_silence(y, top_db=top_db)
+        skip_features = compute_mfcc_mean(active, sr)
+        skip_time += time.perf_counter() - start
+
+        full_probs = bundle.predict(bundle.scale(full_features))
+        skip_probs = bundle.predict(bundle.scale(skip_features))
+        rows.append({
+            "file": path,
+            "skipped_fraction": float(skipped),
+            "full_label": str(labels[int(np.argmax(full_probs))]),
+            "skip_label": str(labels[int(np.argmax(skip_probs))]),
+            "full_confidence": float(np.max(full_probs)),
+            "skip_confidence": float(np.max(skip_probs)),
+        })
+    if not rows:
+        raise RuntimeError(f"No usable audio files found in {audio_dir}")
+
+    skipped = np.array([r["skipped_fraction"] for r in rows])
+    agreement = np.mean([r["full_label"] == r["skip_label"] for r in rows])
+    return {
+        "clips": len(rows),
+        "audio_seconds": audio_seconds,
+        "top_db": top_db,
+        "skipped_fraction": {
+            "mean": float(np.mean(skipped)),
+            "max": float(np.max(skipped)),
+            "clips_with_skips": int(np.count_nonzero(skipped > 0)),
+        },
+        "throughput": {
+            "full_clips_per_sec": len(rows) / full_time,
+            "skip_clips_per_sec": len(rows) / skip_time,
+            "speedup": full_time / skip_time,
+        },
+        "label_agreement": float(agreement),
+        "changed": [r for r in rows if r["full_label"] != r["skip_label"]],
+    }
+
+
+def print_report(report):
+    sk, tp = report["skipped_fraction"], report["throughput"]
+    print("\n=== Silence skipping validation ===")
+    print(f"Clips:              {report['clips']} ({report['audio_seconds']:.1f} s of audio), top_db={report['top_db']}")
+    print(f"Audio skipped:      mean {sk['mean'] * 100:.1f}%, max {sk['max'] * 100:.1f}%, "
+          f"{sk['clips_with_skips']} clips affected")
+    print(f"Throughput full:    {tp['full_clips_per_sec']:.2f} clips/s")
+    print(f"Throughput skip:    {tp['skip_clips_per_sec']:.2f} clips/s ({tp['speedup']:.2f}x, includes energy pass)")
+    print(f"Label agreement:    {report['label_agreement'] * 100:.2f}%")
+    for r in report["changed"]:
+        print(f"  ≠ {r['file']}: {r['full_label']} ({r['full_confidence']:.2f}) -> "
+              f"{r['skip_label']} ({r['skip_confidence']:.2f}), skipped {r['skipped_fraction'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate silence skipping before MFCC pooling.")
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--audio-dir", required=True, help="Directory of audio files to compare on")
+    parser.add_argument("--top-db", type=float, default=SILENCE_TOP_DB)
+    parser.add_argument("--json", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    result = run_validation(args.model_dir, args.audio_dir, args.top_db)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
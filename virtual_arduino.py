@@ -0,0 +1,203 @@
+# virtual_arduino.py
+# Pseudo-terminal backed stand-in for the PneumoAI Arduino, for load and soak
+# testing SerialCommunicator and rfid_reader.py without the real board.
+# Linux/macOS only (needs the pty module).
+#
+# Usage:
+#   python virtual_arduino.py --baudrate 9600 --rfid-result success
+# then point SerialCommunicator / rfid_reader at the printed port.
+import argparse
+import os
+import pty
+import random
+import select
+import threading
+import time
+import tty
+from log_utils import setup_logging, get_logger
+
+logger = get_logger("virtual_arduino")
+
+BITS_PER_BYTE = 10 # 8N1: start bit + 8 data bits + stop bit
+
+
+class VirtualArduino:
+    """
+    Speaks the same line protocol as the real board:
+      lcd:<text>\\n                     -> ack:lcd
+      servo:H,HT;L,LT;R,RT\\n           -> ack:servo once the longest hold time has elapsed
+      rfid:auth\\n                      -> rfid:success:<uid> / rfid:failed / rfid:timeout
+    Like the firmware, commands are handled one at a time on a single loop, so a
+    servo hold blocks everything queued behind it. Bytes in both directions are
+    paced at the configured baud rate.
+
+    Faults: drop_rate skips a response, garble_rate flips a byte in a response,
+    latency_jitter_ms adds random extra delay before every response.
+    """
+    def __init__(self, baudrate=9600, ack_latency_ms=5, rfid_latency_ms=800,
+                 rfid_result="success", rfid_uid="DE:AD:BE:EF", send_acks=True,
+                 hold_servos=True, drop_rate=0.0, garble_rate=0.0,
+                 latency_jitter_ms=0, seed=None):
+        self.baudrate = baudrate
+        self.ack_latency_ms = ack_latency_ms
+        self.rfid_latency_ms = rfid_latency_ms
+        self.rfid_result = rfid_result # "success", "failed" or "timeout"
+        self.rfid_uid = rfid_uid
+        self.send_acks = send_acks
+        self.hold_servos = hold_servos
+        self.drop_rate = drop_rate
+        self.garble_rate = garble_rate
+        self.latency_jitter_ms = latency_jitter_ms
+        self.random = random.Random(seed)
+
+        self.lcd_text = ""
+        self.servo_state = None # ((H, HT), (L, LT), (R, RT)) of the last servo command
+        self.stats = {"lines": 0, "lcd": 0, "servo": 0, "rfid": 0, "unknown": 0, "malformed": 0,
+                      "bytes_in": 0, "bytes_out": 0, "dropped": 0, "garbled": 0}
+        self.stats_lock = threading.Lock()
+
+        self.master_fd, self.slave_fd = pty.openpty()
+        tty.setraw(self.slave_fd) # No echo or newline translation, like a real UART
+        self.port = os.ttyname(self.slave_fd)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def byte_time(self):
+        return BITS_PER_BYTE / self.baudrate
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"🤖 Virtual Arduino listening on {self.port} at {self.baudrate} baud.")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        # The slave fd is held open for the device's whole lifetime so the master
+        # does not see EIO every time a client closes and reopens the port.
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key, n=1):
+        with self.stats_lock:
+            self.stats[key] += n
+
+    def _run(self):
+        buffer = b""
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self.master_fd], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(self.master_fd, 1024)
+            except OSError:
+                continue
+            # Model the UART: the bytes only "arrive" after their transmission time
+            time.sleep(len(chunk) * self.byte_time)
+            self._count("bytes_in", len(chunk))
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self._handle_line(line.decode("ascii", errors="replace").strip("\r"))
+
+    def _handle_line(self, line):
+        self._count("lines")
+        command, _, payload = line.partition(":")
+        if command == "lcd":
+            self._count("lcd")
+            self.lcd_text = payload[:32] # 16x2 display
+            self._respond("ack:lcd", self.ack_latency_ms)
+        elif command == "servo":
+            self._handle_servo(payload)
+        elif command == "rfid":
+            self._count("rfid")
+            self._handle_rfid()
+        else:
+            self._count("unknown")
+            self._respond(f"err:unknown:{command}", self.ack_latency_ms)
+
+    def _handle_servo(self, payload):
+        try:
+            parts = [p.split(",") for p in payload.split(";")]
+            servos = tuple((int(angle), int(hold)) for angle, hold in parts)
+            if len(servos) != 3:
+                raise ValueError("expected 3 servos")
+        except ValueError:
+            self._count("malformed")
+            self._respond("err:servo", self.ack_latency_ms)
+            return
+        self._count("servo")
+        self.servo_state = servos
+        if self.hold_servos:
+            # The firmware blocks for the longest hold time before reading the next command
+            time.sleep(max(hold for _, hold in servos) / 1000.0)
+        self._respond("ack:servo", self.ack_latency_ms)
+
+    def _handle_rfid(self):
+        if self.rfid_result == "success":
+            self._respond(f"rfid:success:{self.rfid_uid}", self.rfid_latency_ms)
+        elif self.rfid_result == "failed":
+            self._respond("rfid:failed", self.rfid_latency_ms)
+        else:
+            self._respond("rfid:timeout", self.rfid_latency_ms)
+
+    def _respond(self, line, latency_ms):
+        if line.startswith("ack:") and not self.send_acks:
+            return
+        delay_ms = latency_ms
+        if self.latency_jitter_ms:
+            delay_ms += self.random.uniform(0, self.latency_jitter_ms)
+        time.sleep(delay_ms / 1000.0)
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            self._count("dropped")
+            return
+        data = bytearray(f"{line}\r\n".encode("ascii"))
+        if self.garble_rate and self.random.random() < self.garble_rate:
+            self._count("garbled")
+            data[self.random.randrange(len(data) - 2)] ^= 0x80 # Non-ASCII byte, newline kept
+        for b in data: # Paced at the baud rate
+            os.write(self.master_fd, bytes([b]))
+            time.sleep(self.byte_time)
+        self._count("bytes_out", len(data))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a virtual PneumoAI Arduino on a pseudo-terminal.")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--ack-latency-ms", type=float, default=5)
+    parser.add_argument("--rfid-latency-ms", type=float, default=800)
+    parser.add_argument("--rfid-result", choices=["success", "failed", "timeout"], default="success")
+    parser.add_argument("--no-acks", action="store_true", help="Don't acknowledge lcd/servo commands")
+    parser.add_argument("--no-servo-hold", action="store_true", help="Don't block for servo hold times")
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--garble-rate", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    setup_logging()
+    device = VirtualArduino(baudrate=args.baudrate, ack_latency_ms=args.ack_latency_ms,
+                            rfid_latency_ms=args.rfid_latency_ms, rfid_result=args.rfid_result,
+                            send_acks=not args.no_acks, hold_servos=not args.no_servo_hold,
+                            drop_rate=args.drop_rate, garble_rate=args.garble_rate,
+                            latency_jitter_ms=args.latency_jitter_ms, seed=args.seed)
+    with device:
+        print(f"Virtual Arduino port: {device.port}", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(f"Stats: {device.stats}")